@@ -1,10 +1,95 @@
 import re
+from collections import deque
 
-content = []           # Current text content as list of characters
+class GapBuffer:
+    """Text stored as a list of characters with a gap at the last edit position."""
+
+    def __init__(self, text='', gap_size=16):
+        """Create a buffer holding text, followed by an empty gap."""
+        self.buf = list(text) + [None] * gap_size
+        self.gap_start = len(text)       # First slot of the gap
+        self.gap_end = len(self.buf)     # First slot after the gap
+
+    def __len__(self):
+        """Return the number of characters in the buffer."""
+        return len(self.buf) - (self.gap_end - self.gap_start)
+
+    def __str__(self):
+        """Return the text without the gap."""
+        return ''.join(self.buf[:self.gap_start] + self.buf[self.gap_end:])
+
+    def char_at(self, pos):
+        """Return the character at text position pos, stepping over the gap."""
+        if pos < self.gap_start:
+            return self.buf[pos]
+        return self.buf[pos + self.gap_end - self.gap_start]
+
+    def move_gap(self, pos):
+        """Move the gap so that it starts at text position pos."""
+        if pos < self.gap_start:  # Shift the characters between pos and the gap to after it
+            count = self.gap_start - pos
+            self.buf[self.gap_end - count:self.gap_end] = self.buf[pos:self.gap_start]
+            self.gap_start -= count
+            self.gap_end -= count
+        elif pos > self.gap_start:  # Shift the characters after the gap to before it
+            count = pos - self.gap_start
+            self.buf[self.gap_start:pos] = self.buf[self.gap_end:self.gap_end + count]
+            self.gap_start += count
+            self.gap_end += count
+
+    def insert(self, pos, text):
+        """Insert text before text position pos."""
+        self.move_gap(pos)
+        if self.gap_end - self.gap_start < len(text):  # Grow the gap by doubling the buffer
+            extra = max(len(text), len(self.buf))
+            self.buf[self.gap_end:self.gap_end] = [None] * extra
+            self.gap_end += extra
+        self.buf[self.gap_start:self.gap_start + len(text)] = text
+        self.gap_start += len(text)
+
+    def delete(self, start, end):
+        """Delete the characters from text position start up to end and return them."""
+        self.move_gap(start)
+        deleted = ''.join(self.buf[self.gap_end:self.gap_end + end - start])
+        self.gap_end += end - start
+        return deleted
+
+    def skip_forward(self, pos, run):
+        """Return the first position from pos where the compiled pattern run stops matching."""
+        buf, gap = self.buf, self.gap_end - self.gap_start
+        for lo, hi, shift in ((pos, self.gap_start, 0), (max(pos, self.gap_start), len(self), gap)):  # Each side of the gap
+            i, stop, size = lo + shift, hi + shift, 16  # Indices into buf
+            while i < stop:  # Match growing slices until the run ends inside one
+                piece = ''.join(buf[i:min(i + size, stop)])
+                matched = run.match(piece).end()
+                i += matched
+                if matched < len(piece):
+                    return i - shift
+                size *= 2
+        return len(self)
+
+    def skip_backward(self, pos, run):
+        """Return where the run matched by the compiled pattern run, read backwards from pos, starts."""
+        buf, gap = self.buf, self.gap_end - self.gap_start
+        for lo, hi, shift in ((self.gap_start, pos, gap), (0, min(pos, self.gap_start), 0)):  # Each side of the gap
+            i, stop, size = hi + shift, lo + shift, 16  # Indices into buf
+            while i > stop:  # Match growing reversed slices until the run ends inside one
+                piece = ''.join(buf[max(i - size, stop):i][::-1])
+                matched = run.match(piece).end()
+                i -= matched
+                if matched < len(piece):
+                    return i - shift
+                size *= 2
+        return 0
+
+content = GapBuffer()  # Current text content
 cursor = 0             # Cursor position (index of the character it's on, or len(content) if after last character)
 cursor_enabled = False # Whether the cursor is displayed
-undo_stack = []        # Stack to store previous states for undo
+undo_stack = deque(maxlen=1024)  # Latest (cursor, edit) pairs to undo, edit being the change that reverts the content
 command_history = []   # History of executed commands for repeat
+space_chars = frozenset(' \t\n\r\f\v')  # Characters that separate words
+space_run = re.compile(f"[{re.escape(''.join(sorted(space_chars)))}]*")  # A run of separating characters
+word_run = re.compile(f"[^{re.escape(''.join(sorted(space_chars)))}]*")  # A run of word characters
 
 help_text = """
 ? - display this help info
@@ -25,38 +110,34 @@ s - show content
 q - quit program
 """
 
-def save_state():
-    """Save the current state (content and cursor) to the undo stack."""
-    global undo_stack, content, cursor
-    undo_stack.append((content.copy(), cursor))
+def save_state(edit=None):
+    """Save the cursor and the edit that reverts the upcoming content change to the undo stack.
+
+    edit is ('insert', pos, text) or ('delete', pos, length), or None if the content is unchanged.
+    """
+    undo_stack.append((cursor, edit))
 
 def display_content():
     """Display the current content, with cursor in green if enabled."""
-    if not cursor_enabled:
-        print(''.join(content))
-    else:
-        if cursor == len(content):  # Cursor at end
-            print(''.join(content) + '\033[42m' + ' ' + '\033[0m')
-        elif 0 <= cursor < len(content):  # Cursor within content
-            print(''.join(content[:cursor]) + '\033[42m' + content[cursor] + '\033[0m' + ''.join(content[cursor+1:]))
-        else:
-            print(''.join(content))  # Fallback for invalid cursor
+    text = str(content)
+    if cursor_enabled:
+        if cursor == len(text):  # Cursor at end
+            text = f'{text}\033[42m \033[0m'
+        elif 0 <= cursor < len(text):  # Cursor within content
+            text = f'{text[:cursor]}\033[42m{text[cursor]}\033[0m{text[cursor+1:]}'
+    print(text)
 
 def next_word_start(content, cursor):
     """Find the starting index of the next word after the cursor."""
-    if cursor >= len(content):
+    end = len(content)
+    if cursor >= end:
         return cursor
-    # If cursor is on a non-space, skip to the end of the current word
-    if not content[cursor].isspace():
-        i = cursor + 1
-        while i < len(content) and not content[i].isspace():
-            i += 1
-    else:
-        i = cursor
-    # Skip trailing spaces to find the next word's start
-    while i < len(content) and content[i].isspace():
-        i += 1
-    if i < len(content):
+    # Skip the rest of the current word, then the spaces after it
+    i = cursor
+    if content.char_at(i) not in space_chars:
+        i = content.skip_forward(i, word_run)
+    i = content.skip_forward(i, space_run)
+    if i < end:
         return i
     return cursor  # No next word, stay put
 
@@ -64,126 +145,180 @@ def previous_word_start(content, cursor):
     """Find the starting index of the previous word before the cursor."""
     if cursor <= 0:
         return 0
-    # Find the first non-space character before the cursor
-    i = cursor - 1
-    while i >= 0 and content[i].isspace():
-        i -= 1
-    if i < 0:
-        return 0
-    # Find the start of that word
-    while i > 0 and not content[i-1].isspace():
-        i -= 1
-    return i
+    # Skip the spaces before the cursor, then the word before them
+    i = cursor
+    if content.char_at(i - 1) in space_chars:
+        i = content.skip_backward(i, space_run)
+    return content.skip_backward(i, word_run)
 
-def execute_command(command):
-    """Execute the given command and update the editor state."""
-    global content, cursor, cursor_enabled, undo_stack, command_history
-    
-    if command == '.':
-        save_state()
-        cursor_enabled = not cursor_enabled
-        command_history.append(command)
-        return True
-    
-    elif command == 'h':
-        save_state()
-        if cursor > 0:
-            cursor -= 1
-        command_history.append(command)
-        return True
-    
-    elif command == 'l':
-        save_state()
-        if cursor < len(content):
-            cursor += 1
-        command_history.append(command)
-        return True
-    
-    elif command == '^':
-        save_state()
-        cursor = 0
-        command_history.append(command)
-        return True
-    
-    elif command == '$':
-        save_state()
+def toggle_cursor(command):
+    """Toggle the row cursor on and off."""
+    global cursor_enabled
+    save_state()
+    cursor_enabled = not cursor_enabled
+    command_history.append(command)
+    return True
+
+def move_left(command):
+    """Move the cursor one character to the left."""
+    global cursor
+    save_state()
+    if cursor > 0:
+        cursor -= 1
+    command_history.append(command)
+    return True
+
+def move_right(command):
+    """Move the cursor one character to the right."""
+    global cursor
+    save_state()
+    if cursor < len(content):
+        cursor += 1
+    command_history.append(command)
+    return True
+
+def move_to_line_start(command):
+    """Move the cursor to the beginning of the line."""
+    global cursor
+    save_state()
+    cursor = 0
+    command_history.append(command)
+    return True
+
+def move_to_line_end(command):
+    """Move the cursor to the last character of the line."""
+    global cursor
+    save_state()
+    cursor = len(content) - 1 if content else 0
+    command_history.append(command)
+    return True
+
+def move_to_next_word(command):
+    """Move the cursor to the beginning of the next word."""
+    global cursor
+    save_state()
+    cursor = next_word_start(content, cursor)
+    command_history.append(command)
+    return True
+
+def move_to_previous_word(command):
+    """Move the cursor to the beginning of the previous word."""
+    global cursor
+    save_state()
+    cursor = previous_word_start(content, cursor)
+    command_history.append(command)
+    return True
+
+def insert_text(command):
+    """Insert the text following 'i' before the cursor."""
+    text = command[1:]
+    save_state(('delete', cursor, len(text)))
+    content.insert(cursor, text)
+    # Cursor remains at the same position
+    command_history.append(command)
+    return True
+
+def append_text(command):
+    """Append the text following 'a' after the cursor."""
+    global cursor
+    text = command[1:]
+    insert_pos = min(cursor + 1, len(content))
+    save_state(('delete', insert_pos, len(text)))
+    content.insert(insert_pos, text)
+    cursor = insert_pos + len(text) - 1 if text else cursor
+    command_history.append(command)
+    return True
+
+def delete_char(command):
+    """Delete the character at the cursor."""
+    global cursor
+    if not 0 <= cursor < len(content):
+        return False  # Nothing under the cursor
+    deleted = content.delete(cursor, cursor + 1)
+    save_state(('insert', cursor, deleted))
+    if cursor >= len(content):
         cursor = len(content) - 1 if content else 0
-        command_history.append(command)
-        return True
-    
-    elif command == 'w':
-        save_state()
-        cursor = next_word_start(content, cursor)
-        command_history.append(command)
-        return True
-    
-    elif command == 'b':
-        save_state()
-        cursor = previous_word_start(content, cursor)
-        command_history.append(command)
-        return True
-    
-    elif re.match(r'^i(.+)', command):
-        text = re.match(r'^i(.+)', command).group(1)
-        save_state()
-        content[cursor:cursor] = list(text)
-        # Cursor remains at the same position
-        command_history.append(command)
-        return True
-    
-    elif re.match(r'^a(.+)', command):
-        text = re.match(r'^a(.+)', command).group(1)
-        save_state()
-        insert_pos = min(cursor + 1, len(content))
-        content[insert_pos:insert_pos] = list(text)
-        cursor = insert_pos + len(text) - 1 if text else cursor
-        command_history.append(command)
-        return True
-    
-    elif command == 'x' and 0 <= cursor < len(content):
-        save_state()
-        del content[cursor]
+    command_history.append(command)
+    return True
+
+def delete_word(command):
+    """Delete the word and trailing spaces at the cursor."""
+    global cursor
+    if cursor < len(content):
+        next_pos = next_word_start(content, cursor)
+        if next_pos > cursor:
+            deleted = content.delete(cursor, next_pos)
+        else:
+            deleted = content.delete(cursor, len(content))
+        save_state(('insert', cursor, deleted))
         if cursor >= len(content):
             cursor = len(content) - 1 if content else 0
-        command_history.append(command)
-        return True
-    
-    elif command == 'dw':
+    else:
         save_state()
-        if cursor < len(content):
-            next_pos = next_word_start(content, cursor)
-            if next_pos > cursor:
-                del content[cursor:next_pos]
+    command_history.append(command)
+    return True
+
+def undo(command):
+    """Restore the state saved before the previous command."""
+    global cursor
+    if undo_stack:
+        prev_cursor, edit = undo_stack.pop()
+        if edit is not None:
+            action, pos, arg = edit
+            if action == 'insert':
+                content.insert(pos, arg)
             else:
-                del content[cursor:]
-            if cursor >= len(content):
-                cursor = len(content) - 1 if content else 0
-        command_history.append(command)
-        return True
-    
-    elif command == 'u':
-        if undo_stack:
-            prev_content, prev_cursor = undo_stack.pop()
-            content = prev_content
-            cursor = prev_cursor
-            if command_history:
-                command_history.pop()
-            return True
-        return False  # Nothing to undo
-    
-    elif command == 'r':
+                content.delete(pos, pos + arg)
+        cursor = prev_cursor
         if command_history:
-            last_command = command_history[-1]
-            save_state()
-            execute_command(last_command)  # Re-execute the last command
-            command_history.append(last_command)
-            return True
-        return False  # No command to repeat
-    
-    elif command == 's':
+            command_history.pop()
         return True
-    
-    return False
+    return False  # Nothing to undo
+
+def repeat(command):
+    """Execute the last command again."""
+    if command_history:
+        last_command = command_history[-1]
+        save_state()
+        execute_command(last_command)  # Re-execute the last command
+        command_history.append(last_command)
+        return True
+    return False  # No command to repeat
+
+def show(command):
+    """Show the content without changing it."""
+    return True
+
+# Handlers for the fixed commands, looked up by the exact command string
+commands = {
+    '.': toggle_cursor,
+    'h': move_left,
+    'l': move_right,
+    '^': move_to_line_start,
+    '$': move_to_line_end,
+    'w': move_to_next_word,
+    'b': move_to_previous_word,
+    'x': delete_char,
+    'dw': delete_word,
+    'u': undo,
+    'r': repeat,
+    's': show,
+}
+
+# Handlers for the commands that carry text after their one-letter prefix
+text_commands = {
+    'i': insert_text,
+    'a': append_text,
+}
+
+def execute_command(command):
+    """Execute the given command and update the editor state."""
+    handler = commands.get(command)
+    if handler is None and len(command) > 1:
+        handler = text_commands.get(command[0])
+    if handler is None:
+        return False
+    return handler(command)
 
 # Main loop to run the editor
 while True:
@@ -23,6 +23,7 @@ Process:
 import turtle
 import random
 import time
+from typing import NamedTuple
 
 # global constants
 YOUR_ID = '124040006' # TODO: your student id
@@ -38,220 +39,413 @@ MIN_STRETCH = 1
 MAX_STRETCH = 10
 MIN_SEED = 1
 MAX_SEED = 99
+UPDATE_INTERVAL = 0.05 # seconds between screen refreshes while filling
+
+class StretchedShape(NamedTuple):
+    '''
+    A shape stretched for the run, with the geometry that does not depend on its position
+    '''
+    coords: tuple         # stretched (x,y) coordinates
+    extent: tuple         # (min_x, max_x, min_y, max_y) of the stretched coordinates
+    outline: tuple        # flattened canvas coordinates, y flipped
+    offset: tuple         # (x,y) centroid of the stretched coordinates
+    radius: float         # distance from the centroid to the farthest vertex
+
+class PlacedShape(NamedTuple):
+    '''
+    A shape placed on the canvas, with the geometry the overlap check reuses
+    '''
+    box: tuple            # (min_x, max_x, min_y, max_y) bounding box with buffer
+    placed_coords: list   # (x,y) coordinates on the canvas
+    segments: list        # (start, end, min_x, max_x, min_y, max_y) for each side
+    edges: list           # (start_x, start_y, vx, vy, length squared) for each side
+    centroid: tuple       # (x,y) average of the placed coordinates
+    radius: float         # distance from the centroid to the farthest vertex
 
 # global variables
-g_shapes = []       # list of (position, coords, color)
+g_shapes = []       # list of PlacedShape
 g_screen = None
 g_range_x = None
 g_range_y = None
+g_home_x = None     # (low, high) range of x for shape home positions
+g_home_y = None     # (low, high) range of y for shape home positions
+g_grid = {}         # map of grid cell (col, row) to indices of g_shapes whose bounding box touches it
+g_cell_size = None  # side length of a grid cell
+g_free_cells = []   # home cells (col, row) of side XY_STEP whose center no placed shape covers
+g_free_index = {}   # map of free home cell (col, row) to its index in g_free_cells
 
-def is_shape_overlapped_any(pos:tuple, coords:list, stretch:float) -> bool:
+def get_bounding_box(coords:list, buffer:float=3.5) -> tuple:
     '''
-    Check if shape at given position overlaps with any existing shapes
+    Get the bounding box of a shape, grown by a buffer on every side
     
     Args:
-        pos (tuple): (x,y) position of shape to check
-        coords (list): List of (x,y) coordinates defining the shape
-        stretch (float): Stretch factor applied to the shape
+        coords (list): List of (x,y) coordinates of the placed shape
+        buffer (float): Gap added around the shape
     
     Returns:
-        bool: True if shape overlaps with any existing shape
+        tuple: (min_x, max_x, min_y, max_y)
     '''
-    def pt_sub(p1, p2):
-        return (p1[0] - p2[0], p1[1] - p2[1])
-
-    def pt_cross(p1, p2):
-        return p1[0] * p2[1] - p1[1] * p2[0]
-
-    def pt_cross_with_points(p, a, b):
-        a_minus_p = pt_sub(a, p)
-        b_minus_p = pt_sub(b, p)
-        return pt_cross(a_minus_p, b_minus_p)
-
-    def sgn(x):
-        return 1 if x > 0 else (-1 if x < 0 else 0)
-
-    def inter1(a, b, c, d, buffer=3.5):
-        if a > b:
-            a, b = b, a
-        if c > d:
-            c, d = d, c
-        return max(a - buffer, c - buffer) <= min(b + buffer, d + buffer)
-
-    def expand_segment(start, end, buffer=3.5):
-        dx = end[0] - start[0]
-        dy = end[1] - start[1]
-        length = (dx**2 + dy**2)**0.5
-        if length < 1e-10:  # Handle very short segments
-            return (start[0] - buffer, start[1] - buffer), (end[0] + buffer, end[1] + buffer)
-        dx, dy = dx/length, dy/length
-        new_start = (start[0] - dx * buffer, start[1] - dy * buffer)
-        new_end = (end[0] + dx * buffer, end[1] + dy * buffer)
-        return new_start, new_end
-
-    def check_inter(a, b, c, d, buffer=3.5):
-        a_exp, b_exp = expand_segment(a, b, buffer)
-        c_exp, d_exp = expand_segment(c, d, buffer)
-        
-        if pt_cross_with_points(c_exp, a_exp, d_exp) == 0 and pt_cross_with_points(c_exp, b_exp, d_exp) == 0:
-            return (inter1(a[0], b[0], c[0], d[0], buffer) and 
-                    inter1(a[1], b[1], c[1], d[1], buffer))
-        return (sgn(pt_cross_with_points(a_exp, b_exp, c_exp)) != sgn(pt_cross_with_points(a_exp, b_exp, d_exp)) and
-                sgn(pt_cross_with_points(c_exp, d_exp, a_exp)) != sgn(pt_cross_with_points(c_exp, d_exp, b_exp)))
-
-    def point_in_polygon(point, polygon):
-        x, y = point
-        inside = False
-        n = len(polygon)
-        for i in range(n):
-            j = (i - 1) % n
-            xi, yi = polygon[i]
-            xj, yj = polygon[j]
-            if ((yi > y) != (yj > y) and 
-                x < (xj - xi) * (y - yi) / (yj - yi + 1e-10) + xi):
-                inside = not inside
-        return inside
-
-    def get_bounding_box(coords, buffer=3.5):
+    xs = [x for x, y in coords]
+    ys = [y for x, y in coords]
+    return (min(xs) - buffer, max(xs) + buffer, min(ys) - buffer, max(ys) + buffer)
+
+def get_placed_box(extent:tuple, pos:tuple, buffer:float=3.5) -> tuple:
+    '''
+    Get the bounding box of a stretched shape at a position, grown by a buffer on every side
+    
+    Args:
+        extent (tuple): (min_x, max_x, min_y, max_y) of the stretched shape around its home
+        pos (tuple): (x,y) position of the shape
+        buffer (float): Gap added around the shape
+    
+    Returns:
+        tuple: (min_x, max_x, min_y, max_y)
+    '''
+    return (extent[0] + pos[0] - buffer, extent[1] + pos[0] + buffer,
+            extent[2] + pos[1] - buffer, extent[3] + pos[1] + buffer)
+
+def get_grid_cell_size(shapes:dict, stretch:float, buffer:float=3.5) -> float:
+    '''
+    Get a grid cell size that fits the largest stretched shape with its buffer
+    
+    Args:
+        shapes (dict): Dictionary of shape names and coordinates
+        stretch (float): Stretch factor applied to the shapes
+        buffer (float): Gap added around each shape
+    
+    Returns:
+        float: Side length of a grid cell
+    '''
+    extent = 0
+    for coords in shapes.values():
         xs = [x for x, y in coords]
         ys = [y for x, y in coords]
-        return (min(xs) - buffer, max(xs) + buffer, min(ys) - buffer, max(ys) + buffer)
-
-    def distance(p1, p2):
-        return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5
-
-    def point_to_segment_distance(p, seg_start, seg_end):
-        v = pt_sub(seg_end, seg_start)
-        w = pt_sub(p, seg_start)
-        length_squared = v[0]**2 + v[1]**2
-        if length_squared < 1e-10:
-            return distance(p, seg_start)
-        t = max(0, min(1, (w[0] * v[0] + w[1] * v[1]) / length_squared))
-        projection = (seg_start[0] + t * v[0], seg_start[1] + t * v[1])
-        return distance(p, projection)
-
-    # Convert coordinates to stretched position
-    new_coords = [(x * stretch + pos[0], y * stretch + pos[1]) for x, y in coords]
-    new_segments = [(new_coords[i], new_coords[(i + 1) % len(new_coords)]) 
-                   for i in range(len(new_coords))]
-    
-    # Get centroid of new shape for containment check
-    centroid_x = sum(x for x, y in new_coords) / len(new_coords)
-    centroid_y = sum(y for x, y in new_coords) / len(new_coords)
-    centroid = (centroid_x, centroid_y)
+        extent = max(extent, max(xs) - min(xs), max(ys) - min(ys))
+    return extent * stretch + 2 * buffer
+
+def get_grid_cells(box:tuple) -> list:
+    '''
+    Get the grid cells covered by a bounding box
+    
+    Args:
+        box (tuple): (min_x, max_x, min_y, max_y)
+    
+    Returns:
+        list: List of (col, row) grid cells
+    '''
+    min_col, max_col = int(box[0] // g_cell_size), int(box[1] // g_cell_size)
+    min_row, max_row = int(box[2] // g_cell_size), int(box[3] // g_cell_size)
+    return [(col, row) for col in range(min_col, max_col + 1) for row in range(min_row, max_row + 1)]
+
+def remove_covered_cells(coords:list) -> None:
+    '''
+    Remove the free home cells whose center lies inside a placed shape
+    
+    Args:
+        coords (list): Placed (x,y) coordinates of the shape
+    '''
+    low_x, low_y = g_home_x[0], g_home_y[0]
+    min_col = int((min(x for x, y in coords) - low_x) // XY_STEP)
+    max_col = int((max(x for x, y in coords) - low_x) // XY_STEP)
+    min_row = int((min(y for x, y in coords) - low_y) // XY_STEP)
+    max_row = int((max(y for x, y in coords) - low_y) // XY_STEP)
+    for col in range(min_col, max_col + 1):
+        for row in range(min_row, max_row + 1):
+            cell = (col, row)
+            center = (low_x + (col + 0.5) * XY_STEP, low_y + (row + 0.5) * XY_STEP)
+            if cell in g_free_index and point_in_polygon(center, coords):
+                # Move the last free cell into the removed one's slot
+                index = g_free_index.pop(cell)
+                last = g_free_cells.pop()
+                if last != cell:
+                    g_free_cells[index] = last
+                    g_free_index[last] = index
+
+def get_placed_geometry(pos:tuple, coords:tuple) -> tuple:
+    '''
+    Move stretched coordinates to a position and get the geometry the overlap check needs
+    
+    Args:
+        pos (tuple): (x,y) position of the shape
+        coords (tuple): Stretched (x,y) coordinates defining the shape
+    
+    Returns:
+        tuple: (placed coords, segments, edges, centroid), segments being
+               (start, end, min_x, max_x, min_y, max_y) and edges being
+               (start_x, start_y, vector_x, vector_y, length squared)
+    '''
+    placed = [(x + pos[0], y + pos[1]) for x, y in coords]
+    segments = []
+    edges = []
+    start_x, start_y = start = placed[-1]
+    for end in placed:
+        end_x, end_y = end
+        min_x, max_x = (start_x, end_x) if start_x < end_x else (end_x, start_x)
+        min_y, max_y = (start_y, end_y) if start_y < end_y else (end_y, start_y)
+        segments.append((start, end, min_x, max_x, min_y, max_y))
+        vx, vy = end_x - start_x, end_y - start_y
+        edges.append((start_x, start_y, vx, vy, vx**2 + vy**2))
+        start_x, start_y, start = end_x, end_y, end
+    centroid = (sum(x for x, y in placed) / len(placed), sum(y for x, y in placed) / len(placed))
+    return placed, segments, edges, centroid
+
+def pt_cross_with_points(p:tuple, a:tuple, b:tuple) -> float:
+    '''
+    Get the cross product of the vectors from p to a and from p to b
+    
+    Args:
+        p (tuple): (x,y) common start point
+        a (tuple): (x,y) end of the first vector
+        b (tuple): (x,y) end of the second vector
+    
+    Returns:
+        float: Positive if p, a, b turn counterclockwise, negative if clockwise, 0 if collinear
+    '''
+    return (a[0] - p[0]) * (b[1] - p[1]) - (a[1] - p[1]) * (b[0] - p[0])
+
+def check_inter(a:tuple, b:tuple, c:tuple, d:tuple) -> bool:
+    '''
+    Check whether two segments properly cross
+    
+    Args:
+        a (tuple): (x,y) start of the first segment
+        b (tuple): (x,y) end of the first segment
+        c (tuple): (x,y) start of the second segment
+        d (tuple): (x,y) end of the second segment
+    
+    Returns:
+        bool: True if each segment has the ends of the other strictly on opposite sides
+    '''
+    return (pt_cross_with_points(a, b, c) * pt_cross_with_points(a, b, d) < 0 and 
+            pt_cross_with_points(c, d, a) * pt_cross_with_points(c, d, b) < 0)
+
+def point_in_polygon(point:tuple, polygon:list) -> bool:
+    '''
+    Check whether a point is inside a polygon by counting the edges a ray to its right crosses
+    
+    Args:
+        point (tuple): (x,y) point to check
+        polygon (list): (x,y) vertices of the polygon in order
+    
+    Returns:
+        bool: True if the point is inside the polygon
+    '''
+    x, y = point
+    inside = False
+    xj, yj = polygon[-1]  # Each edge runs from the previous vertex to the current one
+    for xi, yi in polygon:
+        # Edge spans y and the point is left of it
+        if (yi > y) != (yj > y) and ((xj - xi) * (y - yi) - (yj - yi) * (x - xi) > 0) == (yj > yi):
+            inside = not inside
+        xj, yj = xi, yi
+    return inside
+
+def distance(p1:tuple, p2:tuple) -> float:
+    '''
+    Args:
+        p1 (tuple): (x,y) first point
+        p2 (tuple): (x,y) second point
+    
+    Returns:
+        float: Distance between the points
+    '''
+    return ((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)**0.5
 
+def point_to_edge_distance_squared(p:tuple, edge:tuple) -> float:
+    '''
+    Args:
+        p (tuple): (x,y) point
+        edge (tuple): (start_x, start_y, vx, vy, length squared) edge from get_placed_geometry
+    
+    Returns:
+        float: Squared distance from the point to the nearest point of the edge
+    '''
+    start_x, start_y, vx, vy, length_squared = edge
+    wx, wy = p[0] - start_x, p[1] - start_y
+    if length_squared < 1e-10:
+        return wx**2 + wy**2
+    t = max(0, min(1, (wx * vx + wy * vy) / length_squared))
+    return (p[0] - (start_x + t * vx))**2 + (p[1] - (start_y + t * vy))**2
+
+def is_shape_overlapped_any(pos:tuple, shape:StretchedShape) -> bool:
+    '''
+    Check if shape at given position overlaps with any existing shapes
+    
+    Args:
+        pos (tuple): (x,y) position of shape to check
+        shape (StretchedShape): Stretched shape from stretch_shape
+    
+    Returns:
+        bool: True if shape overlaps with any existing shape
+    '''
+    coords, radius = shape.coords, shape.radius
+    center = (pos[0] + shape.offset[0], pos[1] + shape.offset[1])
     # Get bounding box of new shape with buffer
-    new_box = get_bounding_box(new_coords)
-
-    for existing_pos, existing_coords, _ in g_shapes:
-        # Convert existing shape coordinates
-        exist_coords = [(x * stretch + existing_pos[0], y * stretch + existing_pos[1]) 
-                       for x, y in existing_coords]
-        exist_segments = [(exist_coords[i], exist_coords[(i + 1) % len(exist_coords)]) 
-                         for i in range(len(exist_coords))]
+    new_box = get_placed_box(shape.extent, pos)
+
+    # Only shapes sharing a grid cell with the new shape can have an overlapping bounding box
+    nearby = {index for cell in get_grid_cells(new_box) for index in g_grid.get(cell, ())}
+    if not nearby:
+        return False
+
+    new_min_x, new_max_x, new_min_y, new_max_y = new_box
+    buffer = 3.5  # Minimum gap between shapes
+    buffer_squared = buffer * buffer  # Distances are compared squared
+
+    # Nearby shapes that pass the quick tests, with their squared centroid distance
+    close = []
+    for index in nearby:
+        existing = g_shapes[index]
+        # Shapes whose bounding boxes (with buffer) are apart can neither touch nor contain each other
+        exist_min_x, exist_max_x, exist_min_y, exist_max_y = existing.box
+        if (new_max_x < exist_min_x or exist_max_x < new_min_x or 
+                new_max_y < exist_min_y or exist_max_y < new_min_y):
+            continue
+
+        # Same for bounding circles
+        exist_centroid = existing.centroid
+        dx, dy = center[0] - exist_centroid[0], center[1] - exist_centroid[1]
+        reach = radius + existing.radius + buffer
+        if dx * dx + dy * dy <= reach * reach:
+            close.append((dx * dx + dy * dy, index))
+    if not close:
+        return False
+
+    # Move stretched coordinates to position, with the centroid for the containment check
+    new_coords, new_segments, new_edges, centroid = get_placed_geometry(pos, coords)
+
+    # Detailed checks, closest shape first
+    close.sort()
+    for _, index in close:
+        existing = g_shapes[index]
+        exist_coords, exist_segments, exist_edges = existing.placed_coords, existing.segments, existing.edges
+        exist_min_x, exist_max_x, exist_min_y, exist_max_y = existing.box
+        exist_centroid = existing.centroid
+
+        # Check vertex proximity
+        for new_vertex in new_coords:
+            new_x, new_y = new_vertex
+            for exist_x, exist_y in exist_coords:
+                if (new_x - exist_x)**2 + (new_y - exist_y)**2 < buffer_squared:
+                    return True
+            for edge in exist_edges:
+                if point_to_edge_distance_squared(new_vertex, edge) < buffer_squared:
+                    return True
         
-        # Check bounding boxes first (with buffer)
-        exist_box = get_bounding_box(exist_coords)
-        if not (new_box[1] < exist_box[0] or exist_box[1] < new_box[0] or 
-                new_box[3] < exist_box[2] or exist_box[3] < new_box[2]):
-            # Check vertex proximity
-            buffer = 3.5
-            for new_vertex in new_coords:
-                for exist_vertex in exist_coords:
-                    if distance(new_vertex, exist_vertex) < buffer:
-                        return True
-                for seg_start, seg_end in exist_segments:
-                    if point_to_segment_distance(new_vertex, seg_start, seg_end) < buffer:
-                        return True
-            
-            for exist_vertex in exist_coords:
-                for seg_start, seg_end in new_segments:
-                    if point_to_segment_distance(exist_vertex, seg_start, seg_end) < buffer:
-                        return True
-            
-            # If bounding boxes overlap (including buffer), do detailed check
-            for seg1_start, seg1_end in new_segments:
-                for seg2_start, seg2_end in exist_segments:
-                    if check_inter(seg1_start, seg1_end, seg2_start, seg2_end):
-                        return True
+        for exist_vertex in exist_coords:
+            for edge in new_edges:
+                if point_to_edge_distance_squared(exist_vertex, edge) < buffer_squared:
+                    return True
+        
+        # No vertex is close to the other shape, but long edges can still cross
+        for seg1_start, seg1_end, min_x1, max_x1, min_y1, max_y1 in new_segments:
+            for seg2_start, seg2_end, min_x2, max_x2, min_y2, max_y2 in exist_segments:
+                # Segments whose boxes are apart cannot cross
+                if max_x1 < min_x2 or max_x2 < min_x1 or max_y1 < min_y2 or max_y2 < min_y1:
+                    continue
+                if check_inter(seg1_start, seg1_end, seg2_start, seg2_end):
+                    return True
         
         # Check if new shape is inside existing shape
-        if point_in_polygon(centroid, exist_coords):
+        if (exist_min_x <= new_min_x and new_max_x <= exist_max_x and 
+                exist_min_y <= new_min_y and new_max_y <= exist_max_y and 
+                point_in_polygon(centroid, exist_coords)):
             return True
             
         # Check if existing shape is inside new shape
-        exist_centroid_x = sum(x for x, y in exist_coords) / len(exist_coords)
-        exist_centroid_y = sum(y for x, y in exist_coords) / len(exist_coords)
-        exist_centroid = (exist_centroid_x, exist_centroid_y)
-        if point_in_polygon(exist_centroid, new_coords):
+        if (new_min_x <= exist_min_x and exist_max_x <= new_max_x and 
+                new_min_y <= exist_min_y and exist_max_y <= new_max_y and 
+                point_in_polygon(exist_centroid, new_coords)):
             return True
                     
     return False
 
 
-def create_shape(coords:list, color:str, stretch_factor:float) -> tuple:
+def stretch_shape(coords:list, stretch_factor:float) -> StretchedShape:
     '''
-    Create shape data with specified parameters
+    Stretch a shape around its home
     
     Args:
         coords (list): List of (x,y) coordinates
-        color (str): Color for the shape
         stretch_factor (float): Stretch factor
     
     Returns:
-        tuple: (coords, color)
+        StretchedShape: Stretched coords with their extent, canvas outline, centroid and radius
     '''
-    return (coords, color)
+    stretched = tuple((x * stretch_factor, y * stretch_factor) for x, y in coords)
+    # The canvas y axis points down, so flip y as turtle does
+    outline = tuple(value for x, y in stretched for value in (x, -y))
+    offset = (sum(x for x, y in stretched) / len(stretched), sum(y for x, y in stretched) / len(stretched))
+    radius = max(distance(vertex, offset) for vertex in stretched)
+    return StretchedShape(stretched, get_bounding_box(stretched, 0), outline, offset, radius)
 
-def get_random_home_position(range_x:list, range_y:list) -> tuple:
+def create_shape(stretched_shape:tuple, color:str) -> tuple:
     '''
-    Generates a random (x, y) coordinate tuple
+    Create shape data with specified parameters
     
     Args:
-        range_x (list): Range of x coordinates
-        range_y (list): Range of y coordinates
+        stretched_shape (StretchedShape): Stretched shape from stretch_shape
+        color (str): Color for the shape
     
     Returns:
-        tuple: Random (x,y) position
+        tuple: (stretched shape, color)
     '''
-    return (random.uniform(min(range_x) + 50, max(range_x) - 50),
-            random.uniform(min(range_y) + 50, max(range_y) - 50))
+    return (stretched_shape, color)
 
-def place_a_random_shape(shape_data:tuple, stretch:float, started:float, duration:int) -> bool:
+def draw_shape(pos:tuple, outline:tuple, color:str) -> None:
+    '''
+    Draw a filled shape as a single polygon on the screen's canvas
+    
+    Args:
+        pos (tuple): (x,y) position of the shape
+        outline (tuple): Canvas outline of the shape at its home, from stretch_shape
+        color (str): Fill and outline color
+    '''
+    # Move the outline to the position
+    offsets = (pos[0], -pos[1]) * (len(outline) // 2)
+    flat_coords = [value + offset for value, offset in zip(outline, offsets)]
+    g_screen.getcanvas().create_polygon(flat_coords, fill=color, outline=color)
+
+def place_a_random_shape(shape_data:tuple, started:float, duration:int) -> bool:
     '''
     Try to place a shape on the canvas
     
     Args:
-        shape_data (tuple): (coordinates, color)
-        stretch (float): Stretch factor
+        shape_data (tuple): (stretched shape, color)
         started (float): Start time
         duration (int): Time limit
     
     Returns:
         bool: True if shape was placed successfully
     '''
-    coords, color = shape_data
+    shape, color = shape_data
     max_attempts = 10000
+    low_x, low_y = g_home_x[0], g_home_y[0]
+    # Candidates are picked by where the centroid goes
+    offset_x, offset_y = shape.offset
+    rand = random.random
+    choice = random.choice
+    time_now = time.time
+    if not g_free_cells:  # Every home cell is covered
+        return False
     
-    for _ in range(max_attempts):
-        if time.time() - started > duration:
+    for attempt in range(max_attempts):
+        # Check the time limit every 128 attempts
+        if (attempt & 127) == 0 and time_now() - started > duration:
             return False
             
-        pos = get_random_home_position(g_range_x, g_range_y)
-        if not is_shape_overlapped_any(pos, coords, stretch):
-            turtle.penup()
-            turtle.goto(pos)
-            turtle.pendown()
-            turtle.color(color)
-            turtle.begin_fill()
-            for x, y in coords:
-                turtle.goto(x * stretch + pos[0], y * stretch + pos[1])
-            first_x, first_y = coords[0]
-            turtle.goto(first_x * stretch + pos[0], first_y * stretch + pos[1])
-            turtle.end_fill()
-            g_shapes.append((pos, coords, color))
-            g_screen.title(f'{YOUR_ID} - {len(g_shapes)}')
-            g_screen.update()
+        col, row = choice(g_free_cells)
+        # Random spot in the cell
+        pos = (low_x + (col + rand()) * XY_STEP - offset_x, low_y + (row + rand()) * XY_STEP - offset_y)
+        if not is_shape_overlapped_any(pos, shape):
+            draw_shape(pos, shape.outline, color)
+            bbox = get_placed_box(shape.extent, pos)
+            for cell in get_grid_cells(bbox):
+                g_grid.setdefault(cell, []).append(len(g_shapes))
+            # Keep the placed geometry for later overlap checks
+            placed_coords, segments, edges, centroid = get_placed_geometry(pos, shape.coords)
+            g_shapes.append(PlacedShape(bbox, placed_coords, segments, edges, centroid, shape.radius))
+            remove_covered_cells(placed_coords)
             return True
     return False
 
@@ -269,11 +463,24 @@ def fill_canvas_with_random_shapes(shapes:dict, colors:tuple, stretch_factor:flo
         float: Start time
     '''
     started = time.time()
-    while time.time() - started <= duration:
-        shape_name = random.choice(list(shapes.keys()))
-        shape_data = create_shape(shapes[shape_name], random.choice(colors), stretch_factor)
-        if not place_a_random_shape(shape_data, stretch_factor, started, duration):
+    last_update = started
+    shape_names = tuple(shapes.keys())
+    # Stretch every shape once
+    stretched_shapes = tuple(stretch_shape(coords, stretch_factor) for coords in shapes.values())
+    while g_free_cells and time.time() - started <= duration:
+        index = random.randrange(len(shape_names))
+        shape_name = shape_names[index]
+        shape_data = create_shape(stretched_shapes[index], random.choice(colors))
+        if not place_a_random_shape(shape_data, started, duration):
             print(f"Could not place shape: {shape_name}")
+        elif time.time() - last_update > UPDATE_INTERVAL:
+            g_screen.title(f'{YOUR_ID} - {len(g_shapes)}')
+            g_screen.update()
+            last_update = time.time()
+    if not g_free_cells:
+        print("Canvas is full")
+    g_screen.title(f'{YOUR_ID} - {len(g_shapes)}')
+    g_screen.update()
     return started
 
 def import_custom_shapes(file_name:str) -> dict:
@@ -282,44 +489,38 @@ def import_custom_shapes(file_name:str) -> dict:
         file_name (str): Path to shapes file
     
     Returns:
-        dict: Dictionary of shape names and coordinates
+        dict: Dictionary of shape names and tuples of (x,y) coordinates
     '''
     shapes = {}
     try:
         with open(file_name, 'r') as file:
-            for line in file:
-                line = line.strip()
-                if not line or ':' not in line:
-                    continue
-                    
-                name, coords_str = line.split(':', 1)
-                name = name.strip()
-                coords_str = coords_str.strip()
-                
-                if coords_str.startswith('(') and coords_str.endswith(')'):
-                    coords_str = coords_str[1:-1]
-                
-                coords = []
-                coord_pairs = coords_str.split('),')
-                for pair in coord_pairs:
-                    pair = pair.strip()
-                    if pair.startswith('('):
-                        pair = pair[1:]
-                    if pair.endswith(')'):
-                        pair = pair[:-1]
-                    try:
-                        x, y = map(float, pair.split(','))
-                        coords.append((x, y))
-                    except ValueError:
-                        continue
-                
-                if coords:
-                    shapes[name] = coords
-                    
+            text = file.read()
     except FileNotFoundError:
         print(f"Error: {file_name} not found.")
         exit(1)
     
+    # Split the text read in one go; a MULTILINE regex scan over it is slower
+    for line in text.split('\n'):
+        name, colon, coords_str = line.strip().partition(':')
+        if not colon:
+            continue
+        coords_str = coords_str.strip()
+        if coords_str.startswith('(') and coords_str.endswith(')'):
+            coords_str = coords_str[1:-1]
+        
+        # float() decides what a number is; a regex accepting the same numbers is slower than these splits
+        coords = []
+        for pair in coords_str.split('),'):
+            pair = pair.strip().removeprefix('(').removesuffix(')')
+            try:
+                x, y = map(float, pair.split(','))
+                coords.append((x, y))
+            except ValueError:
+                continue
+        
+        if coords:
+            shapes[name.strip()] = tuple(coords)
+    
     if not shapes:
         print("No valid shapes could be loaded.")
         exit(1)
@@ -341,6 +542,38 @@ def setup_canvas_ranges(w:int, h:int, span:float=0.8, step:int=10) -> tuple:
     sz_w, sz_h = w/2*span, h/2*span
     return ([-sz_w, sz_w], [-sz_h, sz_h])
 
+def setup_home_ranges(range_x:list, range_y:list, margin:float=50) -> tuple:
+    '''
+    Calculate the ranges shape home positions are picked from
+    
+    Args:
+        range_x (list): Range of x coordinates
+        range_y (list): Range of y coordinates
+        margin (float): Distance kept from the canvas edges
+    
+    Returns:
+        tuple: ((low_x, high_x), (low_y, high_y))
+    '''
+    return ((min(range_x) + margin, max(range_x) - margin),
+            (min(range_y) + margin, max(range_y) - margin))
+
+def setup_free_cells(home_x:tuple, home_y:tuple, step:int=10) -> tuple:
+    '''
+    Split the home ranges into cells that candidate positions are picked from
+    
+    Args:
+        home_x (tuple): (low, high) range of x for shape home positions
+        home_y (tuple): (low, high) range of y for shape home positions
+        step (int): Side length of a cell
+    
+    Returns:
+        tuple: (list of free cells (col, row), map of free cell to its index in the list)
+    '''
+    cols = int((home_x[1] - home_x[0]) // step)
+    rows = int((home_y[1] - home_y[0]) // step)
+    cells = [(col, row) for col in range(cols) for row in range(rows)]
+    return cells, {cell: index for index, cell in enumerate(cells)}
+
 def setup_screen() -> turtle.Screen:
     '''
     Setup turtle screen
@@ -390,15 +623,18 @@ def prompt_input() -> tuple:
     return stretch, seed, duration, termination
 
 def main() -> None:
-    global g_screen, g_range_x, g_range_y
+    global g_screen, g_range_x, g_range_y, g_home_x, g_home_y, g_cell_size, g_free_cells, g_free_index
     
     g_screen = setup_screen()
     g_range_x, g_range_y = setup_canvas_ranges(g_screen.window_width(), 
                                               g_screen.window_height(),
                                               XY_SPAN, XY_STEP)
+    g_home_x, g_home_y = setup_home_ranges(g_range_x, g_range_y)
+    g_free_cells, g_free_index = setup_free_cells(g_home_x, g_home_y, XY_STEP)
     
     shapes = import_custom_shapes(SHAPE_FILE)
     stretch, seed, duration, termination = prompt_input()
+    g_cell_size = get_grid_cell_size(shapes, stretch)
     
     random.seed(seed)
     started = fill_canvas_with_random_shapes(shapes, COLORS, stretch, duration)